@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class BudgetLimits:
+    """Max sessions created in a rolling window; 0 means unlimited."""
+
+    repo_hourly: int = 0
+    repo_daily: int = 0
+    account_hourly: int = 0
+    account_daily: int = 0
+
+    def __bool__(self) -> bool:
+        return any((self.repo_hourly, self.repo_daily, self.account_hourly, self.account_daily))
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    # RFC 3339 from the API may carry nanoseconds, which fromisoformat rejects.
+    match = re.match(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)?$", value or "")
+    if not match:
+        return None
+    base, fraction, tz = match.groups()
+    text = base + (f".{fraction[:6]}" if fraction else "") + ("+00:00" if tz in (None, "Z") else tz)
+    return datetime.fromisoformat(text).astimezone(timezone.utc)
+
+
+class SessionLedger:
+    """
+    Creation times of recent sessions, keyed by session name, persisted as JSON.
+
+    Also remembers prompts deferred by the budget so the next tick runs them
+    even if their schedule no longer matches.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.sessions: dict[str, dict[str, str]] = {}
+        self.deferred: dict[str, list[str]] = {}
+        self._local = 0
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError as e:
+                # The ledger is a cache; reconciling against the API rebuilds it.
+                print(f"Warning: Ignoring unreadable budget file {path}: {e}")
+                data = {}
+            self.sessions = data.get("sessions", {})
+            self.deferred = data.get("deferred", {})
+
+    def add(self, key: str | None, repo: str, created: datetime) -> None:
+        if not key:
+            self._local += 1
+            key = f"local/{created.isoformat()}/{self._local}"
+        self.sessions[key] = {"repo": repo, "created": created.isoformat()}
+
+    def reconcile(self, sessions: Iterable[dict[str, Any]]) -> None:
+        """Merge sessions reported by ``list_sessions`` (the account's source of truth)."""
+        for session in sessions:
+            created = parse_timestamp(session.get("createTime") or "")
+            key = session.get("name") or session.get("id")
+            if not created or not key:
+                continue
+            source = (session.get("sourceContext") or {}).get("source") or ""
+            self.add(key, source.removeprefix("sources/github/"), created)
+
+    def count(self, now: datetime, window: timedelta, repo: str | None = None) -> int:
+        since = now - window
+        return sum(
+            1
+            for entry in self.sessions.values()
+            if (repo is None or entry["repo"] == repo) and datetime.fromisoformat(entry["created"]) > since
+        )
+
+    def save(self, now: datetime) -> None:
+        if not self.path:
+            return
+        since = now - DAY
+        self.sessions = {
+            k: v for k, v in self.sessions.items() if datetime.fromisoformat(v["created"]) > since
+        }
+        self.deferred = {repo: ids for repo, ids in self.deferred.items() if ids}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps({"sessions": self.sessions, "deferred": self.deferred}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+
+
+class AdmissionController:
+    """Admit session creation for one repo while rolling-window budgets allow it."""
+
+    def __init__(self, ledger: SessionLedger, limits: BudgetLimits, *, repo_full: str, now: datetime):
+        self.ledger = ledger
+        self.limits = limits
+        self.repo_full = repo_full
+        self.now = now
+
+    def check(self) -> str | None:
+        """Return why a new session would exceed the budget, or None if it fits."""
+        checks = (
+            ("repo hourly", self.limits.repo_hourly, HOUR, self.repo_full),
+            ("repo daily", self.limits.repo_daily, DAY, self.repo_full),
+            ("account hourly", self.limits.account_hourly, HOUR, None),
+            ("account daily", self.limits.account_daily, DAY, None),
+        )
+        for name, limit, window, repo in checks:
+            if limit and self.ledger.count(self.now, window, repo=repo) >= limit:
+                return f"{name} budget of {limit} reached"
+        return None
+
+    def record(self, session: dict[str, Any]) -> None:
+        created = parse_timestamp(session.get("createTime") or "") or self.now
+        self.ledger.add(session.get("name") or session.get("id"), self.repo_full, created)
+
+    def pending(self) -> list[str]:
+        return list(self.ledger.deferred.get(self.repo_full, []))
+
+    def defer(self, prompt_id: str) -> None:
+        pending = self.ledger.deferred.setdefault(self.repo_full, [])
+        if prompt_id not in pending:
+            pending.append(prompt_id)
+
+    def prune(self, prompt_ids: Iterable[str]) -> None:
+        """Forget deferred prompts that are no longer enabled (disabled, renamed or deleted)."""
+        keep = set(prompt_ids)
+        if self.repo_full in self.ledger.deferred:
+            self.ledger.deferred[self.repo_full] = [
+                p for p in self.ledger.deferred[self.repo_full] if p in keep
+            ]
+
+    def resolve(self, prompt_id: str) -> None:
+        if prompt_id in self.ledger.deferred.get(self.repo_full, []):
+            self.ledger.deferred[self.repo_full].remove(prompt_id)
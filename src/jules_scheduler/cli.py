@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, StrictUndefined
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateError
 
+from .budget import DAY, AdmissionController, BudgetLimits, SessionLedger, parse_timestamp
 from .client import JulesClient
-from .github_utils import github_has_open_pr
+from .config import load_config
+from .dispatch import DispatchQueue, count_in_flight, group_key
+from .forecast import forecast
+from .github_utils import github_has_open_pr, list_open_jules_pr_titles
 from .prompt_files import PromptFile, load_prompt_files
 from .repo_context import detect_repo
 from .workflow import write_workflow
@@ -22,14 +30,19 @@ class RunContext:
     repo: str
     repo_full: str
     now_utc: datetime
+    templates_dir: Path | None = None
 
 
-def _env() -> Environment:
-    return Environment(undefined=StrictUndefined, autoescape=False)
+@lru_cache(maxsize=None)
+def _env(templates_dir: Path | None = None) -> Environment:
+    # One environment per templates dir: Jinja caches compiled includes/parents
+    # and, with auto_reload, recompiles them when the file's mtime changes.
+    loader = FileSystemLoader(str(templates_dir)) if templates_dir else None
+    return Environment(loader=loader, undefined=StrictUndefined, autoescape=False, auto_reload=True)
 
 
 def _render(text: str, ctx: RunContext) -> str:
-    template = _env().from_string(text)
+    template = _env(ctx.templates_dir).from_string(text)
     return template.render(
         owner=ctx.owner,
         repo=ctx.repo,
@@ -43,24 +56,31 @@ def _default_title(prompt: PromptFile, ctx: RunContext) -> str:
     return f"routine/{prompt.id}: {ctx.repo}"
 
 
+def _prompt_title(prompt: PromptFile, ctx: RunContext) -> str:
+    return _render(prompt.title, ctx) if prompt.title else _default_title(prompt, ctx)
+
+
 def _run_prompt(
     *,
     client: JulesClient,
     prompt: PromptFile,
     ctx: RunContext,
     dry_run: bool,
-) -> None:
-    title = _render(prompt.title, ctx) if prompt.title else _default_title(prompt, ctx)
+    open_pr_titles: list[str] | None = None,
+) -> dict | None:
+    title = _prompt_title(prompt, ctx)
 
-    if prompt.dedupe and github_has_open_pr(ctx.owner, ctx.repo, title_prefix=title):
+    if prompt.dedupe and github_has_open_pr(
+        ctx.owner, ctx.repo, title_prefix=title, open_titles=open_pr_titles
+    ):
         print(f"skip {prompt.id}: open PR exists for title prefix: {title}")
-        return
+        return None
 
     rendered_prompt = _render(prompt.body, ctx)
 
     if dry_run or os.environ.get("DRY_RUN") == "true":
         print(f"[DRY RUN] create session: {ctx.repo_full} :: {title}")
-        return
+        return {}
 
     session = client.create_session(
         prompt=rendered_prompt,
@@ -73,14 +93,48 @@ def _run_prompt(
     )
     session_id = session.get("name") or session.get("id")
     print(f"created session for {prompt.id}: {session_id}")
+    return session
+
+
+# Hard cap on session pages fetched per tick (100 sessions each).
+MAX_SESSION_PAGES = 10
+
+
+def _list_sessions(client: JulesClient) -> list[dict] | None:
+    # Sessions of any age can still be in flight (plan approvals sit for days),
+    # so no age cutoff here; MAX_SESSION_PAGES bounds the cost instead.
+    try:
+        return list(client.iter_sessions(max_pages=MAX_SESSION_PAGES))
+    except Exception as e:
+        print(f"Warning: Failed to list in-flight sessions: {e}")
+        return None
+
+
+def _in_flight(
+    sessions: list[dict] | None, prompts: list[PromptFile], ctx: RunContext
+) -> tuple[int, Counter[str]]:
+    if not sessions:
+        return (0, Counter())
+    groups_by_title = {}
+    for prompt in prompts:
+        if not prompt.enabled:
+            continue
+        try:
+            groups_by_title[_prompt_title(prompt, ctx)] = group_key(prompt)
+        except TemplateError as e:
+            # Its sessions still count toward the repo total, just not a group.
+            print(f"Warning: Failed to render title for {prompt.id}: {e}")
+    return count_in_flight(sessions, owner=ctx.owner, repo=ctx.repo, groups_by_title=groups_by_title)
 
 
 def cmd_init(args: argparse.Namespace) -> None:
     repo_root = Path(args.repo_root).resolve()
     prompts_dir = repo_root / ".jules" / "prompts"
+    partials_dir = repo_root / ".jules" / "partials"
     workflow_path = repo_root / ".github" / "workflows" / "jules_scheduler.yml"
 
     prompts_dir.mkdir(parents=True, exist_ok=True)
+    partials_dir.mkdir(parents=True, exist_ok=True)
     (repo_root / ".github" / "workflows").mkdir(parents=True, exist_ok=True)
 
     example_prompt = prompts_dir / "janitor.md"
@@ -116,7 +170,13 @@ This folder contains Jules Scheduler prompts.
 
 - Put prompts in `.jules/prompts/*.md`
 - Each prompt is a Markdown file with YAML frontmatter + a Jinja2 template body.
+- Shared snippets go in `.jules/partials/`; use `{% include "partials/<name>.md" %}`
+  or `{% extends "partials/<name>.md" %}` from a prompt body.
 - Run `jules-scheduler sync-workflow` after adding/editing schedules.
+- `config.yml` (optional) sets `tick` limits and budgets; re-run `sync-workflow`
+  after setting budgets so the workflow caches the ledger.
+- `budget.json` is written by `tick` when session budgets are set; it remembers
+  recent sessions and prompts deferred to a later tick.
 """,
             encoding="utf-8",
         )
@@ -131,61 +191,245 @@ This folder contains Jules Scheduler prompts.
     print(f"- workflow: {workflow_path}")
 
 
-def cmd_sync_workflow(args: argparse.Namespace) -> None:
-    repo_root = Path(args.repo_root).resolve()
+def _sync_one(repo_root: Path, args: argparse.Namespace) -> str:
     prompts_dir = repo_root / args.prompts_dir
-    workflow_path = repo_root / args.workflow_path
-
-    write_workflow(
-        workflow_path=workflow_path,
+    if args.fleet and not prompts_dir.is_dir():
+        return "skipped"
+    changed = write_workflow(
+        workflow_path=repo_root / args.workflow_path,
         prompts_dir=prompts_dir,
         source_ref=args.scheduler_source_ref,
     )
-    print(f"wrote workflow: {workflow_path}")
+    return "changed" if changed else "unchanged"
+
+
+def cmd_sync_workflow(args: argparse.Namespace) -> None:
+    if not args.fleet:
+        repo_root = Path(args.repo_root).resolve()
+        workflow_path = repo_root / args.workflow_path
+        if _sync_one(repo_root, args) == "changed":
+            print(f"wrote workflow: {workflow_path}")
+        else:
+            print(f"workflow unchanged: {workflow_path}")
+        return
+
+    # Fleet mode: each checkout is independent, so render/compare them in parallel
+    # and only report the ones that were rewritten or failed.
+    roots = [Path(r).resolve() for r in args.fleet]
+    results: Counter[str] = Counter()
+    with ThreadPoolExecutor(max_workers=min(32, len(roots))) as pool:
+        futures = {pool.submit(_sync_one, root, args): root for root in roots}
+        for future in futures:
+            root = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                status = "failed"
+                print(f"failed {root}: {e}")
+            results[status] += 1
+            if status == "changed":
+                print(f"updated {root / args.workflow_path}")
+
+    print(
+        f"summary: changed={results['changed']} unchanged={results['unchanged']} "
+        f"skipped={results['skipped']} failed={results['failed']} repos={len(roots)}"
+    )
+    if results["failed"]:
+        sys.exit(1)
+
+
+def _flag_or(value: int | None, default: int) -> int:
+    return default if value is None else value
 
 
 def cmd_tick(args: argparse.Namespace) -> None:
     repo_root = Path(args.repo_root).resolve()
     prompts_dir = repo_root / args.prompts_dir
+    dry_run = args.dry_run or os.environ.get("DRY_RUN") == "true"
+    client = JulesClient()
 
-    owner, repo = detect_repo(repo_root, owner=args.owner, repo=args.repo)
-    if not owner or not repo:
-        print("Error: failed to detect repo. Provide --owner and --repo.")
+    # .jules/config.yml holds the repo's limits and budgets; flags override it.
+    try:
+        config = load_config(prompts_dir.parent)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(2)
-
-    ctx = RunContext(
-        owner=owner,
-        repo=repo,
-        repo_full=f"{owner}/{repo}",
-        now_utc=datetime.now(timezone.utc).replace(second=0, microsecond=0),
+    group_limit = _flag_or(args.group_limit, config.group_limit)
+    repo_limit = _flag_or(args.repo_limit, config.repo_limit)
+    limits = BudgetLimits(
+        repo_hourly=_flag_or(args.repo_hourly_budget, config.repo_hourly_budget),
+        repo_daily=_flag_or(args.repo_daily_budget, config.repo_daily_budget),
+        account_hourly=_flag_or(args.account_hourly_budget, config.account_hourly_budget),
+        account_daily=_flag_or(args.account_daily_budget, config.account_daily_budget),
     )
 
-    prompts = load_prompt_files(prompts_dir)
-    if args.prompt_id:
-        prompts = [p for p in prompts if p.id == args.prompt_id]
-        if not prompts:
-            print(f"Error: prompt id not found: {args.prompt_id}")
+    # Startup I/O is independent: the git remote lookup, prompt parsing, the
+    # credential fetch and the in-flight session list all run at once, and the
+    # open-PR list is fetched as soon as the repo is known.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        repo_future = pool.submit(detect_repo, repo_root, owner=args.owner, repo=args.repo)
+        prompts_future = pool.submit(load_prompt_files, prompts_dir)
+        if not dry_run:
+            # Failures are left in the future and surface again on the first API call.
+            pool.submit(client.authenticate)
+        sessions_future = None
+        if group_limit or repo_limit or limits:
+            sessions_future = pool.submit(_list_sessions, client)
+
+        owner, repo = repo_future.result()
+        if not owner or not repo:
+            print("Error: failed to detect repo. Provide --owner and --repo.")
             sys.exit(2)
 
-    client = JulesClient()
-    ran = 0
-    skipped = 0
+        ctx = RunContext(
+            owner=owner,
+            repo=repo,
+            repo_full=f"{owner}/{repo}",
+            now_utc=datetime.now(timezone.utc).replace(second=0, microsecond=0),
+            templates_dir=prompts_dir.parent,
+        )
 
-    for prompt in prompts:
-        if not prompt.enabled:
-            skipped += 1
-            continue
-        if not args.all and not prompt.is_due(ctx.now_utc):
+        prompts = prompts_future.result()
+        enabled_ids = {p.id for p in prompts if p.enabled}
+        if args.prompt_id:
+            prompts = [p for p in prompts if p.id == args.prompt_id]
+            if not prompts:
+                print(f"Error: prompt id not found: {args.prompt_id}")
+                sys.exit(2)
+
+        admission = None
+        pending: set[str] = set()
+        if limits:
+            budget_file = Path(args.budget_file) if args.budget_file else repo_root / config.budget_file
+            ledger = SessionLedger(budget_file)
+            admission = AdmissionController(ledger, limits, repo_full=ctx.repo_full, now=ctx.now_utc)
+            admission.prune(enabled_ids)
+            pending = set(admission.pending())
+
+        due = [
+            p
+            for p in prompts
+            if p.enabled and (args.all or p.is_due(ctx.now_utc) or p.id in pending)
+        ]
+        titles_future = None
+        if any(p.dedupe for p in due):
+            titles_future = pool.submit(list_open_jules_pr_titles, owner, repo)
+
+        sessions = sessions_future.result() if sessions_future else None
+        in_flight_total, in_flight_groups = _in_flight(sessions, prompts, ctx)
+        if admission and sessions:
+            # Budgets only look back one day.
+            since = ctx.now_utc - DAY
+            admission.ledger.reconcile(
+                s for s in sessions if (parse_timestamp(s.get("createTime") or "") or ctx.now_utc) > since
+            )
+        open_pr_titles = titles_future.result() if titles_future else None
+
+    ran = 0
+    skipped = len(prompts) - len(due)
+    queue = DispatchQueue(
+        due,
+        group_limit=group_limit,
+        repo_limit=repo_limit,
+        in_flight_total=in_flight_total,
+        in_flight_groups=in_flight_groups,
+    )
+    for prompt in queue:
+        if admission:
+            reason = admission.check()
+            if reason:
+                # Kept in the ledger so a later tick runs it once budget frees up.
+                print(f"defer {prompt.id}: {reason}")
+                admission.defer(prompt.id)
+                skipped += 1
+                continue
+        session = _run_prompt(
+            client=client,
+            prompt=prompt,
+            ctx=ctx,
+            dry_run=dry_run,
+            open_pr_titles=open_pr_titles,
+        )
+        if session is not None:
+            queue.started(prompt)
+            ran += 1
+            if admission:
+                admission.record(session)
+        else:
             skipped += 1
-            continue
-        _run_prompt(client=client, prompt=prompt, ctx=ctx, dry_run=args.dry_run)
-        ran += 1
+        if admission:
+            admission.resolve(prompt.id)
         if ran >= args.max_sessions:
             break
 
+    for prompt in queue.over_limit:
+        print(f"skip {prompt.id}: concurrency limit reached for {group_key(prompt)} (not run this tick)")
+        skipped += 1
+
+    if admission and not dry_run:
+        admission.ledger.save(ctx.now_utc)
+
     print(f"summary: ran={ran} skipped={skipped} prompts={len(prompts)}")
 
 
+def cmd_forecast(args: argparse.Namespace) -> None:
+    repo_root = Path(args.repo_root).resolve()
+    prompts_dir = repo_root / args.prompts_dir
+    if not 1 <= args.days <= 366:
+        print("Error: --days must be between 1 and 366")
+        sys.exit(2)
+    if args.session_minutes < 1:
+        print("Error: --session-minutes must be at least 1")
+        sys.exit(2)
+    start = args.start or datetime.now(timezone.utc).date()
+
+    prompts = [p for p in load_prompt_files(prompts_dir) if p.enabled]
+    schedules = [s for p in prompts for s in p.effective_schedule]
+    result = forecast(schedules, start=start, days=args.days)
+
+    peak_minute, peak_minute_count = result.peak_minute()
+    peak_hour, peak_hour_count = result.peak_hour()
+    peak_conc, peak_conc_count = result.peak_concurrency(args.session_minutes)
+    report = {
+        "start": result.start.isoformat(),
+        "days": result.days,
+        "prompts": len(prompts),
+        "schedules": len(schedules),
+        "total_sessions": result.total,
+        "peak_minute": {"at": peak_minute.isoformat(), "sessions": peak_minute_count},
+        "peak_hour": {"at": peak_hour.isoformat(), "sessions": peak_hour_count},
+        "peak_concurrency": {
+            "at": peak_conc.isoformat(),
+            "sessions": peak_conc_count,
+            "session_minutes": args.session_minutes,
+        },
+        "per_hour_of_day": result.per_hour_of_day(),
+        "per_minute_of_hour": result.per_minute_of_hour(),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"forecast: {report['start']} +{result.days}d prompts={len(prompts)} "
+        f"schedules={len(schedules)} sessions={result.total}"
+    )
+    print(f"peak minute: {report['peak_minute']['at']} sessions={peak_minute_count}")
+    print(f"peak hour: {report['peak_hour']['at']} sessions={peak_hour_count}")
+    print(
+        f"peak concurrency ({args.session_minutes}m sessions): "
+        f"{report['peak_concurrency']['at']} sessions={peak_conc_count}"
+    )
+    print("per hour of day (UTC):")
+    for hour, count in enumerate(report["per_hour_of_day"]):
+        if count:
+            print(f"  {hour:02d}:00 {count}")
+    print("per minute of hour:")
+    for minute, count in enumerate(report["per_minute_of_hour"]):
+        if count:
+            print(f"  :{minute:02d} {count}")
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(prog="jules-scheduler")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -213,6 +457,12 @@ def main(argv: list[str] | None = None) -> None:
         default="git+https://github.com/franklinbaldo/jules_scheduler@main",
         help="uvx --from reference for this scheduler repo",
     )
+    p_sync.add_argument(
+        "--fleet",
+        nargs="+",
+        metavar="REPO_ROOT",
+        help="Sync many local checkouts in parallel (ignores --repo-root; skips repos without a prompts dir)",
+    )
     p_sync.set_defaults(func=cmd_sync_workflow)
 
     p_tick = sub.add_parser("tick", help="Run any prompts due right now")
@@ -224,8 +474,66 @@ def main(argv: list[str] | None = None) -> None:
     p_tick.add_argument("--dry-run", action="store_true", help="Do not call Jules API")
     p_tick.add_argument("--all", action="store_true", help="Ignore schedules and run all enabled prompts")
     p_tick.add_argument("--max-sessions", type=int, default=100, help="Max sessions to create per run")
+    p_tick.add_argument(
+        "--group-limit",
+        type=int,
+        default=None,
+        help="Max active sessions per concurrency group, counting in-flight ones, default from .jules/config.yml (0 = unlimited)",
+    )
+    p_tick.add_argument(
+        "--repo-limit",
+        type=int,
+        default=None,
+        help="Max active sessions for the repo, counting in-flight ones, default from .jules/config.yml (0 = unlimited)",
+    )
+    p_tick.add_argument(
+        "--budget-file",
+        help="JSON ledger of recent sessions and budget-deferred prompts (default: budget_file in .jules/config.yml)",
+    )
+    p_tick.add_argument(
+        "--repo-hourly-budget",
+        type=int,
+        default=None,
+        help="Max sessions created for the repo in a rolling hour, default from .jules/config.yml (0 = unlimited)",
+    )
+    p_tick.add_argument(
+        "--repo-daily-budget",
+        type=int,
+        default=None,
+        help="Max sessions created for the repo in a rolling day, default from .jules/config.yml (0 = unlimited)",
+    )
+    p_tick.add_argument(
+        "--account-hourly-budget",
+        type=int,
+        default=None,
+        help="Max sessions created by the account in a rolling hour, default from .jules/config.yml (0 = unlimited)",
+    )
+    p_tick.add_argument(
+        "--account-daily-budget",
+        type=int,
+        default=None,
+        help="Max sessions created by the account in a rolling day, default from .jules/config.yml (0 = unlimited)",
+    )
     p_tick.set_defaults(func=cmd_tick)
 
+    p_forecast = sub.add_parser("forecast", help="Forecast session load from prompt schedules")
+    p_forecast.add_argument("--repo-root", default=".", help="Repo root")
+    p_forecast.add_argument("--prompts-dir", default=".jules/prompts", help="Prompts directory")
+    p_forecast.add_argument("--days", type=int, default=30, help="Horizon in days (1-366)")
+    p_forecast.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        help="First UTC day (YYYY-MM-DD, default: today)",
+    )
+    p_forecast.add_argument(
+        "--session-minutes",
+        type=int,
+        default=30,
+        help="Assumed session duration for the peak concurrency estimate",
+    )
+    p_forecast.add_argument("--json", action="store_true", help="Print the report as JSON")
+    p_forecast.set_defaults(func=cmd_forecast)
+
     args = parser.parse_args(argv)
     args.func(args)
 
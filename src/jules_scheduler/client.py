@@ -5,11 +5,16 @@ A simple Python client for interacting with Google's Jules API.
 """
 
 import argparse
+import heapq
 import json
 import os
 import subprocess
 import sys
-from typing import Any
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, TextIO
 
 import requests
 
@@ -34,6 +39,7 @@ class JulesClient:
         )
         self.access_token = None
         self.using_oauth = False  # Track if we're using OAuth vs API key
+        self._token_lock = threading.Lock()  # One gcloud call even under threads
 
     def _get_headers(self) -> dict[str, str]:
         """Get request headers with authentication."""
@@ -41,24 +47,29 @@ class JulesClient:
         if self.api_key:
             headers["X-Goog-Api-Key"] = self.api_key
         else:
-            if not self.access_token:
-                try:
-                    result = subprocess.run(
-                        ["gcloud", "auth", "print-access-token"],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
-                    self.access_token = result.stdout.strip()
-                except subprocess.CalledProcessError as e:
-                    raise Exception(
-                        "Failed to get access token. Make sure you either:\n"
-                        "1. Set JULES_API_KEY environment variable, or\n"
-                        "2. Authenticate with gcloud: gcloud auth login"
-                    ) from e
+            with self._token_lock:
+                if not self.access_token:
+                    try:
+                        result = subprocess.run(
+                            ["gcloud", "auth", "print-access-token"],
+                            capture_output=True,
+                            text=True,
+                            check=True,
+                        )
+                        self.access_token = result.stdout.strip()
+                    except subprocess.CalledProcessError as e:
+                        raise Exception(
+                            "Failed to get access token. Make sure you either:\n"
+                            "1. Set JULES_API_KEY environment variable, or\n"
+                            "2. Authenticate with gcloud: gcloud auth login"
+                        ) from e
             headers["Authorization"] = f"Bearer {self.access_token}"
         return headers
 
+    def authenticate(self) -> None:
+        """Resolve credentials now (may spawn gcloud) instead of on first request."""
+        self._get_headers()
+
     def create_session(  # noqa: PLR0913
         self,
         prompt: str,
@@ -119,18 +130,54 @@ class JulesClient:
         response.raise_for_status()
         return response.json()
 
-    def list_sessions(self) -> dict[str, Any]:
+    def list_sessions(
+        self, page_size: int | None = None, page_token: str | None = None
+    ) -> dict[str, Any]:
         """
         List all sessions.
 
+        Args:
+            page_size: Optional max number of sessions to return
+            page_token: Optional token from a previous response's nextPageToken
+
         Returns:
             List of session objects
         """
         url = f"{self.base_url}/sessions"
-        response = requests.get(url, headers=self._get_headers())
+        params: dict[str, Any] = {}
+        if page_size:
+            params["pageSize"] = page_size
+        if page_token:
+            params["pageToken"] = page_token
+        response = requests.get(url, headers=self._get_headers(), params=params or None)
         response.raise_for_status()
         return response.json()
 
+    def iter_sessions(
+        self, page_size: int = 100, max_pages: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over all sessions, following nextPageToken.
+
+        Pages are fetched lazily, so stopping iteration stops further requests.
+
+        Args:
+            page_size: Sessions per page
+            max_pages: Optional cap on the number of pages fetched
+
+        Yields:
+            Session objects
+        """
+        token = None
+        pages = 0
+        while True:
+            page = self.list_sessions(page_size=page_size, page_token=token)
+            pages += 1
+            yield from page.get("sessions", [])
+            token = page.get("nextPageToken")
+            if not token or (max_pages and pages >= max_pages):
+                return
+
     def send_message(self, session_id: str, message: str) -> dict[str, Any]:
         """
         Send a message to an active session.
@@ -163,22 +210,288 @@ class JulesClient:
         response.raise_for_status()
         return response.json()
 
-    def get_activities(self, session_id: str) -> dict[str, Any]:
+    def get_activities(
+        self,
+        session_id: str,
+        page_size: int | None = None,
+        page_token: str | None = None,
+    ) -> dict[str, Any]:
         """
         Get activities for a session.
 
         Args:
             session_id: The session ID
+            page_size: Optional max number of activities to return
+            page_token: Optional token from a previous response's nextPageToken
 
         Returns:
             List of activity objects
         """
         url = f"{self.base_url}/sessions/{session_id}/activities"
-        response = requests.get(url, headers=self._get_headers())
+        params: dict[str, Any] = {}
+        if page_size:
+            params["pageSize"] = page_size
+        if page_token:
+            params["pageToken"] = page_token
+        response = requests.get(url, headers=self._get_headers(), params=params or None)
         response.raise_for_status()
         return response.json()
 
 
+# Session states that no longer accept messages or plan approvals.
+TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED"})
+
+
+def session_id_of(session: dict[str, Any]) -> str:
+    """Return the bare session ID from a session object ("sessions/<id>" names allowed)."""
+    return session.get("id") or (session.get("name") or "").rsplit("/", 1)[-1]
+
+
+def select_sessions(
+    client: JulesClient,
+    title_prefix: str | None = None,
+    prompt_id: str | None = None,
+    state: str | None = None,
+) -> list[str]:
+    """
+    Select session IDs by title prefix, scheduler prompt id and/or state.
+
+    Sessions in a terminal state (completed, failed, cancelled) are skipped
+    unless ``state`` asks for one explicitly.
+
+    Args:
+        client: Jules client
+        title_prefix: Keep sessions whose title starts with this
+        prompt_id: Keep sessions created by this prompt (default "routine/<id>:" title)
+        state: Keep sessions in this state (e.g. AWAITING_PLAN_APPROVAL)
+
+    Returns:
+        Matching session IDs
+    """
+    prefixes = [p for p in (title_prefix, f"routine/{prompt_id}:" if prompt_id else None) if p]
+    selected = []
+    for session in client.iter_sessions():
+        title = session.get("title") or ""
+        if any(not title.startswith(p) for p in prefixes):
+            continue
+        if state and session.get("state") != state:
+            continue
+        if not state and session.get("state") in TERMINAL_STATES:
+            continue
+        selected.append(session_id_of(session))
+    return selected
+
+
+def _load_done(progress_path: str | None, command: str | None) -> set[str]:
+    if not progress_path or not os.path.exists(progress_path):
+        return set()
+    done = set()
+    with open(progress_path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                # e.g. a line truncated when a previous run was killed mid-write
+                print(f"Warning: Skipping unreadable line {lineno} in {progress_path}", file=sys.stderr)
+                continue
+            if item.get("ok") and item.get("command") == command and "session" in item:
+                done.add(item["session"])
+    return done
+
+
+def bulk_apply(
+    action: Callable[[str], Any],
+    session_ids: list[str],
+    workers: int = 8,
+    progress_path: str | None = None,
+    out: TextIO | None = None,
+    command: str | None = None,
+) -> tuple[int, int, int]:
+    """
+    Run ``action`` on many sessions with a bounded thread pool.
+
+    Each result is written to ``out`` as a JSON line. With ``progress_path``,
+    successes are appended there and skipped on the next run of the same
+    ``command``, so an interrupted sweep can be resumed.
+
+    Args:
+        action: Called with each session ID (e.g. ``client.approve_plan``)
+        session_ids: Sessions to act on
+        workers: Max concurrent requests
+        progress_path: Optional JSON Lines file recording completed sessions
+        out: Stream for per-session results (default: stdout)
+        command: Name recorded with each result; only matching entries are resumed
+
+    Returns:
+        (ok, failed, skipped) counts
+    """
+    out = out or sys.stdout
+    done = _load_done(progress_path, command)
+    todo = [sid for sid in dict.fromkeys(session_ids) if sid not in done]
+    skipped = len(session_ids) - len(todo)
+    ok = failed = 0
+    progress = open(progress_path, "a+", encoding="utf-8") if progress_path else None
+    if progress and progress.tell():
+        # Start on a fresh line if a killed run left a partial one behind.
+        progress.seek(progress.tell() - 1)
+        if progress.read(1) != "\n":
+            progress.write("\n")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(action, sid): sid for sid in todo}
+            for future in as_completed(futures):
+                item: dict[str, Any] = {"session": futures[future], "command": command}
+                try:
+                    future.result()
+                    item["ok"] = True
+                    ok += 1
+                except Exception as e:
+                    item.update(ok=False, error=str(e))
+                    failed += 1
+                line = json.dumps(item)
+                out.write(line + "\n")
+                out.flush()
+                if progress and item["ok"]:
+                    progress.write(line + "\n")
+                    progress.flush()
+    finally:
+        if progress:
+            progress.close()
+    return (ok, failed, skipped)
+
+
+def _add_selection_args(parser: argparse.ArgumentParser, default_state: str | None) -> None:
+    parser.add_argument("--title-prefix", help="Only sessions whose title starts with this")
+    parser.add_argument("--prompt-id", help="Only sessions created by this scheduler prompt")
+    parser.add_argument("--state", default=default_state, help="Only sessions in this state")
+    parser.add_argument("--workers", type=int, default=8, help="Max concurrent requests")
+    parser.add_argument("--progress", help="JSON Lines file to record and resume progress")
+
+
+# Activity keys that mark the end of a session.
+FINAL_ACTIVITY_KEYS = ("sessionCompleted", "sessionFailed")
+
+
+class ActivityCursor:
+    """Where a session's activity listing has been read up to."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.page_token: str | None = None  # Token of the last (partial) page read
+        self.seen: set[str] = set()  # Activities already emitted from that page
+        self.finished = False
+        self.errors = 0  # Consecutive failed polls
+
+
+def poll_activities(
+    client: JulesClient, cursor: ActivityCursor, page_size: int = 100
+) -> list[dict[str, Any]]:
+    """
+    Fetch activities added since the last poll.
+
+    Only the page the cursor points at (and any pages after it) is requested,
+    so earlier activities are not downloaded again.
+
+    Args:
+        client: Jules client
+        cursor: Cursor for the session; updated in place
+        page_size: Activities per page
+
+    Returns:
+        New activity objects, oldest first
+    """
+    # Cursor state is only committed once every page has been read, so a failed
+    # fetch partway through leaves the cursor as it was and nothing is repeated.
+    new: list[dict[str, Any]] = []
+    token = cursor.page_token
+    seen = cursor.seen
+    finished = cursor.finished
+    while True:
+        page = client.get_activities(cursor.session_id, page_size=page_size, page_token=token)
+        activities = page.get("activities", [])
+        keys = set()
+        for activity in activities:
+            key = activity.get("name") or activity.get("id") or json.dumps(activity, sort_keys=True)
+            keys.add(key)
+            if key not in seen:
+                new.append(activity)
+                if any(k in activity for k in FINAL_ACTIVITY_KEYS):
+                    finished = True
+        next_token = page.get("nextPageToken")
+        if not next_token:
+            cursor.page_token = token
+            cursor.seen = keys
+            cursor.finished = finished
+            return new
+        token = next_token
+        seen = set()
+
+
+def _is_client_error(error: Exception) -> bool:
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+def follow_activities(  # noqa: PLR0913
+    client: JulesClient,
+    session_ids: list[str],
+    out: TextIO | None = None,
+    min_interval: float = 2.0,
+    max_interval: float = 60.0,
+    max_errors: int = 5,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> None:
+    """
+    Stream new activities for several sessions as JSON Lines.
+
+    Each session is polled on its own interval: it resets to ``min_interval``
+    when new activities arrive and doubles up to ``max_interval`` while the
+    session is quiet. A session is dropped once it completes or fails, when
+    the API rejects it with a 4xx (other than 429), or after ``max_errors``
+    consecutive failed polls.
+
+    Args:
+        client: Jules client
+        session_ids: Sessions to follow
+        out: Stream to write one JSON activity per line to (default: stdout)
+        min_interval: Shortest delay between polls of one session (seconds)
+        max_interval: Longest delay between polls of one session (seconds)
+        max_errors: Consecutive failed polls before a session is dropped
+        sleep: Sleep function (injectable for tests)
+        clock: Monotonic clock (injectable for tests)
+    """
+    out = out or sys.stdout
+    now = clock()
+    queue = [(now, i, ActivityCursor(sid), min_interval) for i, sid in enumerate(session_ids)]
+    heapq.heapify(queue)
+    while queue:
+        due, i, cursor, interval = heapq.heappop(queue)
+        delay = due - clock()
+        if delay > 0:
+            sleep(delay)
+        try:
+            activities = poll_activities(client, cursor)
+            cursor.errors = 0
+        except Exception as e:
+            print(f"Error: {cursor.session_id}: {e}", file=sys.stderr)
+            activities = []
+            cursor.errors += 1
+            if _is_client_error(e) or cursor.errors >= max_errors:
+                print(f"Error: {cursor.session_id}: giving up", file=sys.stderr)
+                continue
+        for activity in activities:
+            out.write(json.dumps(activity) + "\n")
+        out.flush()
+        if cursor.finished:
+            continue
+        interval = min_interval if activities else min(interval * 2, max_interval)
+        heapq.heappush(queue, (clock() + interval, i, cursor, interval))
+
+
 def main(argv: list[str] | None = None) -> None:
     """CLI interface for Jules API."""
     parser = argparse.ArgumentParser(description="Jules API Client Helper")
@@ -222,11 +535,34 @@ def main(argv: list[str] | None = None) -> None:
     )
     approve_parser.add_argument("session_id", help="The session ID")
 
+    # Bulk commands
+    bulk_approve_parser = subparsers.add_parser(
+        "bulk-approve-plan", help="Approve plans for all matching sessions"
+    )
+    _add_selection_args(bulk_approve_parser, default_state="AWAITING_PLAN_APPROVAL")
+
+    bulk_message_parser = subparsers.add_parser(
+        "bulk-message", help="Send a message to all matching sessions"
+    )
+    bulk_message_parser.add_argument("message", nargs="+", help="Message content")
+    _add_selection_args(bulk_message_parser, default_state=None)
+
     # Activities command
     activities_parser = subparsers.add_parser(
         "activities", help="Get activities for a session"
     )
-    activities_parser.add_argument("session_id", help="The session ID")
+    activities_parser.add_argument("session_ids", nargs="+", help="The session ID(s)")
+    activities_parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Stream new activities as JSON Lines until the sessions finish",
+    )
+    activities_parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=60.0,
+        help="Longest delay between polls of a quiet session (seconds)",
+    )
 
     args = parser.parse_args(argv)
     client = JulesClient()
@@ -250,8 +586,47 @@ def main(argv: list[str] | None = None) -> None:
             result = client.send_message(args.session_id, " ".join(args.message))
         elif args.command == "approve-plan":
             result = client.approve_plan(args.session_id)
+        elif args.command in ("bulk-approve-plan", "bulk-message"):
+            if not (args.title_prefix or args.prompt_id or args.state):
+                parser.error(
+                    f"{args.command} needs at least one of --title-prefix, --prompt-id or --state"
+                )
+            if args.command == "bulk-approve-plan":
+                action = client.approve_plan
+            else:
+                message = " ".join(args.message)
+
+                def action(sid: str) -> dict[str, Any]:
+                    return client.send_message(sid, message)
+
+            session_ids = select_sessions(
+                client,
+                title_prefix=args.title_prefix,
+                prompt_id=args.prompt_id,
+                state=args.state,
+            )
+            ok, failed, skipped = bulk_apply(
+                action,
+                session_ids,
+                workers=args.workers,
+                progress_path=args.progress,
+                command=args.command,
+            )
+            print(f"summary: ok={ok} failed={failed} skipped={skipped}", file=sys.stderr)
+            if failed:
+                sys.exit(1)
+            return
+        elif args.command == "activities" and args.follow:
+            try:
+                follow_activities(client, args.session_ids, max_interval=args.max_interval)
+            except KeyboardInterrupt:
+                pass
+            return
         elif args.command == "activities":
-            result = client.get_activities(args.session_id)
+            if len(args.session_ids) > 1:
+                result = {sid: client.get_activities(sid) for sid in args.session_ids}
+            else:
+                result = client.get_activities(args.session_ids[0])
         else:
             parser.print_help()
             sys.exit(1)
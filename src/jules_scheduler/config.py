@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .budget import BudgetLimits
+
+CONFIG_NAME = "config.yml"
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """
+    Repo-level tick settings read from ``.jules/config.yml``.
+
+    Lives next to the prompts so it survives ``sync-workflow``; ``tick`` flags
+    override individual values. Limits and budgets of 0 mean unlimited.
+    """
+
+    group_limit: int = 0
+    repo_limit: int = 0
+    repo_hourly_budget: int = 0
+    repo_daily_budget: int = 0
+    account_hourly_budget: int = 0
+    account_daily_budget: int = 0
+    budget_file: str = ".jules/budget.json"
+
+    @property
+    def budgets(self) -> BudgetLimits:
+        return BudgetLimits(
+            repo_hourly=self.repo_hourly_budget,
+            repo_daily=self.repo_daily_budget,
+            account_hourly=self.account_hourly_budget,
+            account_daily=self.account_daily_budget,
+        )
+
+
+def load_config(jules_dir: Path) -> SchedulerConfig:
+    path = jules_dir / CONFIG_NAME
+    if not path.exists():
+        return SchedulerConfig()
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping")
+
+    values: dict[str, Any] = {}
+    for field in fields(SchedulerConfig):
+        if field.name not in data:
+            continue
+        value = data[field.name]
+        if field.type == "int":
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"{path}: expected {field.name} as a non-negative int")
+        elif not isinstance(value, str) or not value:
+            raise ValueError(f"{path}: expected {field.name} as a string")
+        values[field.name] = value
+    unknown = sorted(set(data) - {f.name for f in fields(SchedulerConfig)})
+    if unknown:
+        raise ValueError(f"{path}: unknown keys: {', '.join(unknown)}")
+    return SchedulerConfig(**values)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .client import TERMINAL_STATES
+from .prompt_files import PromptFile
+
+
+def group_key(prompt: PromptFile) -> str:
+    return prompt.concurrency_group or f"branch:{prompt.branch}"
+
+
+def count_in_flight(
+    sessions: Iterable[dict[str, Any]],
+    *,
+    owner: str,
+    repo: str,
+    groups_by_title: Mapping[str, str],
+) -> tuple[int, Counter[str]]:
+    """
+    Count active sessions for ``owner/repo``.
+
+    Returns the repo-wide total and a per-group count. Sessions are attributed
+    to a group when their title matches a known prompt title; others only count
+    toward the repo total.
+    """
+    source = f"sources/github/{owner}/{repo}"
+    total = 0
+    per_group: Counter[str] = Counter()
+    for session in sessions:
+        if session.get("state") in TERMINAL_STATES:
+            continue
+        if (session.get("sourceContext") or {}).get("source") != source:
+            continue
+        total += 1
+        group = groups_by_title.get(session.get("title") or "")
+        if group:
+            per_group[group] += 1
+    return (total, per_group)
+
+
+class DispatchQueue:
+    """
+    Priority queue of due prompts with per-group and repo-wide slot limits.
+
+    Higher ``priority`` dispatches first; ties keep filename order. A limit of
+    0 means unlimited. Call :meth:`started` for every session actually created
+    so later prompts see the slot as taken.
+    """
+
+    def __init__(
+        self,
+        prompts: Iterable[PromptFile],
+        *,
+        group_limit: int = 0,
+        repo_limit: int = 0,
+        in_flight_total: int = 0,
+        in_flight_groups: Mapping[str, int] | None = None,
+    ):
+        self._heap = [(-p.priority, i, p) for i, p in enumerate(prompts)]
+        heapq.heapify(self._heap)
+        self.group_limit = group_limit
+        self.repo_limit = repo_limit
+        self.active_total = in_flight_total
+        self.active_groups: Counter[str] = Counter(in_flight_groups or {})
+        self.over_limit: list[PromptFile] = []
+
+    def _has_slot(self, prompt: PromptFile) -> bool:
+        if self.repo_limit and self.active_total >= self.repo_limit:
+            return False
+        if self.group_limit and self.active_groups[group_key(prompt)] >= self.group_limit:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[PromptFile]:
+        while self._heap:
+            _, _, prompt = heapq.heappop(self._heap)
+            if self._has_slot(prompt):
+                yield prompt
+            else:
+                self.over_limit.append(prompt)
+
+    def started(self, prompt: PromptFile) -> None:
+        self.active_total += 1
+        self.active_groups[group_key(prompt)] += 1
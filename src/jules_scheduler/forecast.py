@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+from croniter import croniter
+
+MINUTES_PER_DAY = 24 * 60
+
+_FULL_RANGES = (range(60), range(24), range(1, 32), range(1, 13), range(7))
+
+
+@dataclass(frozen=True)
+class Forecast:
+    """Fire counts per minute from ``start`` (UTC midnight) over ``days`` days."""
+
+    start: datetime
+    days: int
+    counts: list[int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def at(self, index: int) -> datetime:
+        return self.start + timedelta(minutes=index)
+
+    def per_hour(self) -> list[int]:
+        return [sum(self.counts[i : i + 60]) for i in range(0, len(self.counts), 60)]
+
+    def per_hour_of_day(self) -> list[int]:
+        hours = [0] * 24
+        for i, hour_total in enumerate(self.per_hour()):
+            hours[i % 24] += hour_total
+        return hours
+
+    def per_minute_of_hour(self) -> list[int]:
+        minutes = [0] * 60
+        for i, count in enumerate(self.counts):
+            if count:
+                minutes[i % 60] += count
+        return minutes
+
+    def peak_minute(self) -> tuple[datetime, int]:
+        index = max(range(len(self.counts)), key=self.counts.__getitem__)
+        return (self.at(index), self.counts[index])
+
+    def peak_hour(self) -> tuple[datetime, int]:
+        hours = self.per_hour()
+        index = max(range(len(hours)), key=hours.__getitem__)
+        return (self.at(index * 60), hours[index])
+
+    def peak_concurrency(self, session_minutes: int) -> tuple[datetime, int]:
+        """Max sessions running at once if each one lasts ``session_minutes``."""
+        best_index, best, running = 0, 0, 0
+        for i, count in enumerate(self.counts):
+            running += count
+            if i >= session_minutes:
+                running -= self.counts[i - session_minutes]
+            if running > best:
+                best_index, best = i, running
+        return (self.at(best_index), best)
+
+
+def _as_values(field: list, full: range) -> list[int] | None:
+    if field == ["*"]:
+        return list(full)
+    if all(isinstance(v, int) for v in field):
+        return sorted(set(field))
+    return None
+
+
+def _day_mask(
+    days: list[date], dom: list[int], month: list[int], dow: list[int], day_or: bool
+) -> list[bool]:
+    dom_set, month_set, dow_set = set(dom), set(month), set(dow)
+    mask = []
+    for d in days:
+        if d.month not in month_set:
+            mask.append(False)
+            continue
+        dom_ok = d.day in dom_set
+        dow_ok = (d.weekday() + 1) % 7 in dow_set
+        mask.append(dom_ok or dow_ok if day_or else dom_ok and dow_ok)
+    return mask
+
+
+def _add_slow(counts: list[int], expr: str, weight: int, start: datetime) -> None:
+    # Features like "L" or "1#2" fall back to stepping croniter.
+    end = start + timedelta(minutes=len(counts))
+    it = croniter(expr, start - timedelta(minutes=1))
+    while True:
+        fire = it.get_next(datetime)
+        if fire >= end:
+            return
+        counts[int((fire - start).total_seconds()) // 60] += weight
+
+
+def forecast(schedules: Iterable[str], *, start: date, days: int) -> Forecast:
+    """
+    Count fire times of every cron expression in ``schedules`` over a minute grid.
+
+    Identical expressions are expanded once and weighted by how often they
+    occur; each expression's fire minutes within a day and the days it matches
+    are computed once, so the cost is per matching day rather than per
+    ``croniter.get_next`` call.
+    """
+    start_dt = datetime.combine(start, time(0, 0), tzinfo=timezone.utc)
+    counts = [0] * (days * MINUTES_PER_DAY)
+    day_list = [start + timedelta(days=d) for d in range(days)]
+    masks: dict[tuple, list[bool]] = {}
+
+    for expr, weight in Counter(schedules).items():
+        fields, nth_weekday = croniter.expand(expr)
+        values = [_as_values(f, full) for f, full in zip(fields[:5], _FULL_RANGES)]
+        has_seconds = len(fields) > 5 and fields[5] != [0]
+        if nth_weekday or has_seconds or any(v is None for v in values):
+            _add_slow(counts, expr, weight, start_dt)
+            continue
+
+        minutes, hours, dom, month, dow = values
+        # Vixie cron: when both day fields are restricted, either may match.
+        day_or = fields[2] != ["*"] and fields[4] != ["*"]
+        key = (tuple(dom), tuple(month), tuple(dow), day_or)
+        if key not in masks:
+            masks[key] = _day_mask(day_list, dom, month, dow, day_or)
+
+        offsets = [h * 60 + m for h in hours for m in minutes]
+        for d, matches in enumerate(masks[key]):
+            if not matches:
+                continue
+            base = d * MINUTES_PER_DAY
+            for offset in offsets:
+                counts[base + offset] += weight
+
+    return Forecast(start=start_dt, days=days, counts=counts)
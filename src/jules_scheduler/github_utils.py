@@ -2,14 +2,14 @@ import os
 import requests
 from typing import Optional
 
-def github_has_open_pr(owner: str, repo: str, title_prefix: str) -> bool:
+def list_open_jules_pr_titles(owner: str, repo: str) -> list[str]:
     """
-    Check if there is an open PR in the repo authored by Jules bot with the given title prefix.
+    Fetch the titles of open PRs in the repo authored by the Jules bot.
     """
     token = os.environ.get("TRIAGE_GH_TOKEN") or os.environ.get("GH_PAT") or os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
     if not token:
         print("Warning: No GitHub token (TRIAGE_GH_TOKEN, GH_PAT, GITHUB_TOKEN) set. Skipping deduplication check.")
-        return False
+        return []
 
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
     headers = {
@@ -26,16 +26,24 @@ def github_has_open_pr(owner: str, repo: str, title_prefix: str) -> bool:
         response.raise_for_status()
         prs = response.json()
 
+        titles = []
         for pr in prs:
             # Check author
             user = pr.get("user", {})
             login = user.get("login", "")
             if "google-labs-jules" in login or login == "google-labs-jules[bot]":
-                # Check title
-                title = pr.get("title", "")
-                if title_prefix.lower() in title.lower():
-                    return True
-        return False
+                titles.append(pr.get("title", ""))
+        return titles
     except Exception as e:
         print(f"Warning: Failed to check GitHub PRs for {owner}/{repo}: {e}")
-        return False
+        return []
+
+def github_has_open_pr(owner: str, repo: str, title_prefix: str, open_titles: Optional[list[str]] = None) -> bool:
+    """
+    Check if there is an open PR in the repo authored by Jules bot with the given title prefix.
+
+    Pass `open_titles` (from `list_open_jules_pr_titles`) to reuse one prefetched PR list.
+    """
+    if open_titles is None:
+        open_titles = list_open_jules_pr_titles(owner, repo)
+    return any(title_prefix.lower() in title.lower() for title in open_titles)
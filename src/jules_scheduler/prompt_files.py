@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -9,8 +11,16 @@ import yaml
 from croniter import croniter
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PromptFile:
+    """
+    Prompt metadata parsed from a file's frontmatter.
+
+    The template body is not kept in memory; :attr:`body` re-reads it from
+    ``path`` on access, so a large catalog only holds the small metadata of
+    prompts that are not dispatched.
+    """
+
     id: str
     path: Path
     enabled: bool
@@ -20,18 +30,52 @@ class PromptFile:
     require_plan_approval: bool
     dedupe: bool
     title: str | None
-    body: str
+    spread_minutes: int = 0
+    priority: int = 0
+    concurrency_group: str | None = None
+
+    @property
+    def body(self) -> str:
+        return _partition(self.path.read_text(encoding="utf-8"))[1]
+
+    @property
+    def effective_schedule(self) -> tuple[str, ...]:
+        if self.spread_minutes <= 1:
+            return self.schedule
+        return tuple(_spread_expr(expr, self.id, self.spread_minutes) for expr in self.schedule)
 
     def is_due(self, now_utc: datetime) -> bool:
         if not self.schedule:
             return False
         now_utc = now_utc.astimezone(timezone.utc).replace(second=0, microsecond=0)
-        return any(croniter.match(expr, now_utc) for expr in self.schedule)
+        return any(croniter.match(expr, now_utc) for expr in self.effective_schedule)
+
 
+def spread_offset(prompt_id: str, window: int) -> int:
+    """Deterministic minute offset in ``[0, window)`` derived from the prompt id."""
+    if window <= 1:
+        return 0
+    digest = hashlib.sha256(prompt_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % window
 
-def _split_frontmatter(text: str) -> tuple[dict[str, Any], str]:
+
+def _spread_expr(expr: str, prompt_id: str, window: int) -> str:
+    # Only fixed minutes ("0 8 * * *" or lists like "0,30 8 * * *") are shifted.
+    # The window is clamped so the latest minute stays inside its hour: a prompt
+    # never fires earlier than configured and the hour/day fields keep their
+    # meaning. Step and range expressions are left untouched.
+    fields = expr.split()
+    if not fields or not all(m.isdigit() for m in fields[0].split(",")):
+        return expr
+    minutes = [int(m) for m in fields[0].split(",")]
+    offset = spread_offset(prompt_id, min(window, 60 - max(minutes)))
+    fields[0] = ",".join(str(m + offset) for m in minutes)
+    return " ".join(fields)
+
+
+def _partition(text: str) -> tuple[str | None, str]:
     if not text.startswith("---\n"):
-        return ({}, text)
+        return (None, text)
 
     lines = text.splitlines(keepends=True)
     end_index = None
@@ -40,14 +84,37 @@ def _split_frontmatter(text: str) -> tuple[dict[str, Any], str]:
             end_index = i
             break
     if end_index is None:
-        return ({}, text)
+        return (None, text)
 
     raw_yaml = "".join(lines[1:end_index])
     body = "".join(lines[end_index + 1 :])
+    return (raw_yaml, body.lstrip("\n"))
+
+
+def _parse_meta(raw_yaml: str | None) -> dict[str, Any]:
+    if raw_yaml is None:
+        return {}
     data = yaml.safe_load(raw_yaml) or {}
     if not isinstance(data, dict):
         data = {}
-    return (data, body.lstrip("\n"))
+    return data
+
+
+def _read_frontmatter(path: Path) -> dict[str, Any]:
+    # Stop at the closing marker so bodies are never read while loading.
+    with path.open(encoding="utf-8") as f:
+        if f.readline() != "---\n":
+            return {}
+        lines: list[str] = []
+        for line in f:
+            if line.strip() == "---":
+                return _parse_meta("".join(lines))
+            lines.append(line)
+    return {}
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
 
 
 def _as_bool(value: Any, default: bool) -> bool:
@@ -66,6 +133,21 @@ def _as_str(value: Any, default: str | None = None) -> str | None:
     raise ValueError("expected string")
 
 
+def _as_int(value: Any, default: int) -> int:
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("expected int")
+    return value
+
+
+def _as_spread(value: Any) -> int:
+    value = _as_int(value, 0)
+    if not 0 <= value <= 60:
+        raise ValueError("expected spread_minutes between 0 and 60")
+    return value
+
+
 def _as_schedule(value: Any) -> tuple[str, ...]:
     if value is None:
         return ()
@@ -77,20 +159,22 @@ def _as_schedule(value: Any) -> tuple[str, ...]:
 
 
 def parse_prompt_file(path: Path) -> PromptFile:
-    raw = path.read_text(encoding="utf-8")
-    meta, body = _split_frontmatter(raw)
+    meta = _read_frontmatter(path)
 
     prompt_id = _as_str(meta.get("id"), default=path.stem)
     if not prompt_id:
         prompt_id = path.stem
 
     enabled = _as_bool(meta.get("enabled"), True)
-    schedule = _as_schedule(meta.get("schedule"))
-    branch = _as_str(meta.get("branch"), "main") or "main"
-    automation_mode = _as_str(meta.get("automation_mode"), "AUTO_CREATE_PR") or "AUTO_CREATE_PR"
+    schedule = tuple(sys.intern(s) for s in _as_schedule(meta.get("schedule")))
+    branch = sys.intern(_as_str(meta.get("branch"), "main") or "main")
+    automation_mode = sys.intern(_as_str(meta.get("automation_mode"), "AUTO_CREATE_PR") or "AUTO_CREATE_PR")
     require_plan_approval = _as_bool(meta.get("require_plan_approval"), False)
     dedupe = _as_bool(meta.get("dedupe"), True)
     title = _as_str(meta.get("title"))
+    spread_minutes = _as_spread(meta.get("spread_minutes"))
+    priority = _as_int(meta.get("priority"), 0)
+    concurrency_group = _intern(_as_str(meta.get("concurrency_group")) or None)
 
     return PromptFile(
         id=prompt_id,
@@ -102,7 +186,9 @@ def parse_prompt_file(path: Path) -> PromptFile:
         require_plan_approval=require_plan_approval,
         dedupe=dedupe,
         title=title,
-        body=body,
+        spread_minutes=spread_minutes,
+        priority=priority,
+        concurrency_group=concurrency_group,
     )
 
 
@@ -2,11 +2,25 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from .config import load_config
 from .prompt_files import load_prompt_files
 
 
-def _workflow_yaml(*, cron_schedules: list[str], source_ref: str) -> str:
+def _cache_step(budget_file: str) -> str:
+    # Each run saves a new entry; the prefix restores the latest one.
+    return f"""      - name: Restore budget ledger
+        uses: actions/cache@v4
+        with:
+          path: {budget_file}
+          key: jules-budget-${{{{ github.run_id }}}}
+          restore-keys: |
+            jules-budget-
+"""
+
+
+def _workflow_yaml(*, cron_schedules: list[str], source_ref: str, budget_file: str | None = None) -> str:
     cron_block = "\n".join([f"    - cron: '{c}'" for c in cron_schedules]) if cron_schedules else "    - cron: '0 8 * * *'"
+    cache_step = _cache_step(budget_file) if budget_file else ""
     return f"""name: Jules Scheduler
 
 on:
@@ -24,7 +38,7 @@ jobs:
     steps:
       - uses: actions/checkout@v4
       - uses: astral-sh/setup-uv@v5
-      - name: Run Jules Scheduler
+{cache_step}      - name: Run Jules Scheduler
         env:
           JULES_API_KEY: ${{{{ secrets.JULES_API_KEY }}}}
           GITHUB_TOKEN: ${{{{ secrets.GITHUB_TOKEN }}}}
@@ -33,9 +47,22 @@ jobs:
 """
 
 
-def write_workflow(*, workflow_path: Path, prompts_dir: Path, source_ref: str) -> None:
+def write_workflow(*, workflow_path: Path, prompts_dir: Path, source_ref: str) -> bool:
+    """Render the workflow and write it only if its content changed. Returns True if written."""
     prompts = load_prompt_files(prompts_dir)
-    schedules = sorted({s for p in prompts if p.enabled for s in p.schedule})
+    schedules = sorted({s for p in prompts if p.enabled for s in p.effective_schedule})
+    config = load_config(prompts_dir.parent)
+    # The ledger only matters when budgets are set; keep it across runs then.
+    budget_file = config.budget_file if config.budgets else None
+    rendered = _workflow_yaml(
+        cron_schedules=schedules, source_ref=source_ref, budget_file=budget_file
+    ).encode("utf-8")
+    try:
+        if workflow_path.read_bytes() == rendered:
+            return False
+    except FileNotFoundError:
+        pass
     workflow_path.parent.mkdir(parents=True, exist_ok=True)
-    workflow_path.write_text(_workflow_yaml(cron_schedules=schedules, source_ref=source_ref), encoding="utf-8")
+    workflow_path.write_bytes(rendered)
+    return True
 
@@ -0,0 +1,81 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from jules_scheduler.budget import AdmissionController, BudgetLimits, SessionLedger, parse_timestamp
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _session(n, repo, minutes_ago):
+    created = NOW - timedelta(minutes=minutes_ago)
+    return {
+        "name": f"sessions/{n}",
+        "createTime": created.strftime("%Y-%m-%dT%H:%M:%S.123456789Z"),
+        "sourceContext": {"source": f"sources/github/{repo}"},
+    }
+
+
+class TestBudget(unittest.TestCase):
+    def test_parse_timestamp_nanoseconds(self):
+        self.assertEqual(
+            parse_timestamp("2025-01-01T12:00:00.123456789Z"),
+            datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(parse_timestamp("yesterday"))
+
+    def test_rolling_window_counts(self):
+        ledger = SessionLedger()
+        ledger.reconcile(
+            [
+                _session(1, "o/r", 10),
+                _session(2, "o/r", 120),
+                _session(3, "o/other", 30),
+                _session(4, "o/r", 60 * 25),
+            ]
+        )
+        ledger.reconcile([_session(1, "o/r", 10)])
+
+        self.assertEqual(ledger.count(NOW, timedelta(hours=1), repo="o/r"), 1)
+        self.assertEqual(ledger.count(NOW, timedelta(days=1), repo="o/r"), 2)
+        self.assertEqual(ledger.count(NOW, timedelta(hours=1)), 2)
+        self.assertEqual(ledger.count(NOW, timedelta(days=1)), 3)
+
+    def test_admission_defers_and_persists(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "budget.json"
+            ledger = SessionLedger(path)
+            ledger.reconcile([_session(1, "o/r", 10), _session(2, "o/r", 60 * 30)])
+            admission = AdmissionController(
+                ledger, BudgetLimits(repo_hourly=2, account_daily=5), repo_full="o/r", now=NOW
+            )
+
+            self.assertIsNone(admission.check())
+            admission.record({"name": "sessions/9"})
+            self.assertEqual(admission.check(), "repo hourly budget of 2 reached")
+            admission.defer("janitor")
+            ledger.save(NOW)
+
+            data = json.loads(path.read_text(encoding="utf-8"))
+            reloaded = AdmissionController(SessionLedger(path), BudgetLimits(), repo_full="o/r", now=NOW)
+
+        self.assertEqual(sorted(data["sessions"]), ["sessions/1", "sessions/9"])
+        self.assertEqual(reloaded.pending(), ["janitor"])
+        reloaded.resolve("janitor")
+        self.assertEqual(reloaded.pending(), [])
+
+    def test_prune_drops_prompts_no_longer_enabled(self):
+        ledger = SessionLedger()
+        ledger.deferred = {"o/r": ["kept", "gone"], "o/other": ["gone"]}
+        AdmissionController(ledger, BudgetLimits(), repo_full="o/r", now=NOW).prune({"kept"})
+
+        self.assertEqual(ledger.deferred, {"o/r": ["kept"], "o/other": ["gone"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,298 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from jules_scheduler.cli import MAX_SESSION_PAGES, RunContext, _list_sessions, _render, main
+from jules_scheduler.client import JulesClient
+
+
+def _ctx(templates_dir):
+    return RunContext(
+        owner="octo",
+        repo="hello",
+        repo_full="octo/hello",
+        now_utc=datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc),
+        templates_dir=templates_dir,
+    )
+
+
+class TestRender(unittest.TestCase):
+    def test_render_without_loader(self):
+        self.assertEqual(_render("hi {{ repo_full }}", _ctx(None)), "hi octo/hello")
+
+    def test_include_and_extends_partials(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "partials").mkdir()
+            (root / "partials" / "rules.md").write_text("Rules for {{ repo }}", encoding="utf-8")
+            (root / "partials" / "base.md").write_text(
+                "head\n{% block task %}{% endblock %}\ntail", encoding="utf-8"
+            )
+            ctx = _ctx(root)
+
+            included = _render('{% include "partials/rules.md" %}', ctx)
+            extended = _render(
+                '{% extends "partials/base.md" %}{% block task %}do {{ repo_full }}{% endblock %}', ctx
+            )
+
+        self.assertEqual(included, "Rules for hello")
+        self.assertEqual(extended, "head\ndo octo/hello\ntail")
+
+    def test_partial_reloads_when_changed(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            partial = root / "partials" / "p.md"
+            partial.parent.mkdir()
+            partial.write_text("one", encoding="utf-8")
+            os.utime(partial, (1_000_000, 1_000_000))
+            ctx = _ctx(root)
+            first = _render('{% include "partials/p.md" %}', ctx)
+
+            partial.write_text("two", encoding="utf-8")
+            os.utime(partial, (2_000_000, 2_000_000))
+            second = _render('{% include "partials/p.md" %}', ctx)
+
+        self.assertEqual((first, second), ("one", "two"))
+
+
+class TestTick(unittest.TestCase):
+    def test_tick_prefetches_open_prs_once(self):
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            for name in ("a", "b", "c"):
+                (prompts / f"{name}.md").write_text(f"---\nid: {name}\n---\n{name}\n", encoding="utf-8")
+
+            out = io.StringIO()
+            with patch(
+                "jules_scheduler.cli.list_open_jules_pr_titles", return_value=["routine/b: hello"]
+            ) as list_titles, redirect_stdout(out):
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all", "--dry-run"])
+
+        list_titles.assert_called_once_with("octo", "hello")
+        self.assertIn("skip b: open PR exists", out.getvalue())
+        self.assertIn("summary: ran=2 skipped=1 prompts=3", out.getvalue())
+
+    def test_tick_group_count_ignores_bad_titles(self):
+        in_flight = {
+            "title": "routine/a: hello",
+            "state": "IN_PROGRESS",
+            "sourceContext": {"source": "sources/github/octo/hello"},
+        }
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text("---\nid: a\ndedupe: false\n---\na\n", encoding="utf-8")
+            (prompts / "b.md").write_text(
+                '---\nid: b\nenabled: false\ntitle: "{{ oops }}"\n---\nb\n', encoding="utf-8"
+            )
+            (prompts / "c.md").write_text(
+                '---\nid: c\nbranch: dev\ntitle: "{{ oops }}"\ndedupe: false\n---\nc\n', encoding="utf-8"
+            )
+
+            out = io.StringIO()
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", return_value=iter([in_flight])), patch(
+                "jules_scheduler.cli._run_prompt", return_value={}
+            ), redirect_stdout(out):
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all", "--group-limit", "1"])
+
+        self.assertIn("Warning: Failed to render title for c", out.getvalue())
+        self.assertIn("skip a: concurrency limit reached for branch:main (not run this tick)", out.getvalue())
+        self.assertIn("summary: ran=1 skipped=2 prompts=3", out.getvalue())
+
+    def test_tick_defers_over_budget_and_runs_later(self):
+        recent = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        existing = {
+            "name": "sessions/1",
+            "createTime": recent,
+            "sourceContext": {"source": "sources/github/octo/hello"},
+        }
+        created = iter([{"name": "sessions/2"}, {"name": "sessions/3"}])
+
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            for name, priority in (("a", 2), ("b", 1)):
+                (prompts / f"{name}.md").write_text(
+                    f'---\nid: {name}\nschedule: "0 0 1 1 *"\npriority: {priority}\ndedupe: false\n---\nx\n',
+                    encoding="utf-8",
+                )
+            budget = str(Path(td) / "budget.json")
+            base = ["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--budget-file", budget]
+
+            first, second = io.StringIO(), io.StringIO()
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", return_value=iter([existing])), patch(
+                "jules_scheduler.cli.JulesClient.authenticate"
+            ), patch("jules_scheduler.cli.JulesClient.create_session", side_effect=lambda **kw: next(created)):
+                with redirect_stdout(first):
+                    main([*base, "--all", "--repo-daily-budget", "2"])
+                with redirect_stdout(second):
+                    main([*base, "--account-daily-budget", "5"])
+
+        self.assertIn("created session for a: sessions/2", first.getvalue())
+        self.assertIn("defer b: repo daily budget of 2 reached", first.getvalue())
+        self.assertIn("created session for b: sessions/3", second.getvalue())
+        self.assertIn("summary: ran=1 skipped=1 prompts=2", second.getvalue())
+
+    def test_list_sessions_is_capped_not_cut_by_age(self):
+        def page(hours_ago, token):
+            created = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            return {"sessions": [{"name": f"sessions/{hours_ago}", "createTime": created}], "nextPageToken": token}
+
+        pages = [page(1, "1"), page(48, "2"), page(2, None)]
+        with patch("jules_scheduler.cli.JulesClient.list_sessions", side_effect=pages):
+            sessions = _list_sessions(JulesClient(api_key="x"))
+
+        self.assertEqual([s["name"] for s in sessions], ["sessions/1", "sessions/48", "sessions/2"])
+
+        endless = [page(1, str(i + 1)) for i in range(MAX_SESSION_PAGES + 5)]
+        with patch("jules_scheduler.cli.JulesClient.list_sessions", side_effect=endless) as list_sessions:
+            sessions = _list_sessions(JulesClient(api_key="x"))
+
+        self.assertEqual(len(sessions), MAX_SESSION_PAGES)
+        self.assertEqual(list_sessions.call_count, MAX_SESSION_PAGES)
+
+    def test_tick_counts_old_in_flight_sessions(self):
+        old = (datetime.now(timezone.utc) - timedelta(hours=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        waiting = {
+            "name": "sessions/1",
+            "title": "routine/a: hello",
+            "state": "AWAITING_PLAN_APPROVAL",
+            "createTime": old,
+            "sourceContext": {"source": "sources/github/octo/hello"},
+        }
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text("---\nid: a\ndedupe: false\n---\na\n", encoding="utf-8")
+
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", return_value=iter([waiting])), redirect_stdout(
+                io.StringIO()
+            ) as out:
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all", "--dry-run",
+                      "--repo-limit", "1"])
+
+        self.assertIn("skip a: concurrency limit reached", out.getvalue())
+        self.assertIn("summary: ran=0", out.getvalue())
+
+    def test_tick_budget_uses_default_ledger(self):
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text("---\nid: a\ndedupe: false\n---\na\n", encoding="utf-8")
+
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", return_value=iter([])), patch(
+                "jules_scheduler.cli.JulesClient.authenticate"
+            ), patch(
+                "jules_scheduler.cli.JulesClient.create_session", return_value={"name": "sessions/7"}
+            ), redirect_stdout(io.StringIO()):
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all",
+                      "--repo-daily-budget", "1"])
+                with redirect_stdout(io.StringIO()) as out:
+                    main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all",
+                          "--repo-daily-budget", "1"])
+            ledger = (Path(td) / ".jules" / "budget.json").read_text(encoding="utf-8")
+
+        self.assertIn("sessions/7", ledger)
+        self.assertIn('"octo/hello": [\n      "a"', ledger)
+        self.assertIn("defer a: repo daily budget of 1 reached", out.getvalue())
+
+
+    def test_tick_prunes_deferred_prompts_that_are_gone(self):
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text('---\nid: a\nschedule: "0 0 1 1 *"\n---\na\n', encoding="utf-8")
+            (prompts / "b.md").write_text("---\nid: b\nenabled: false\n---\nb\n", encoding="utf-8")
+            budget = Path(td) / ".jules" / "budget.json"
+            budget.write_text(
+                json.dumps({"sessions": {}, "deferred": {"octo/hello": ["a", "b", "deleted"]}}), encoding="utf-8"
+            )
+
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", return_value=iter([])), patch(
+                "jules_scheduler.cli.JulesClient.authenticate"
+            ), redirect_stdout(io.StringIO()):
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--prompt-id", "b",
+                      "--repo-daily-budget", "5"])
+            deferred = json.loads(budget.read_text(encoding="utf-8"))["deferred"]
+
+        self.assertEqual(deferred, {"octo/hello": ["a"]})
+
+    def test_tick_reads_limits_and_budgets_from_config(self):
+        with tempfile.TemporaryDirectory() as td:
+            prompts = Path(td) / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text("---\nid: a\ndedupe: false\n---\na\n", encoding="utf-8")
+            (Path(td) / ".jules" / "config.yml").write_text(
+                "repo_daily_budget: 1\nbudget_file: state/ledger.json\n", encoding="utf-8"
+            )
+            base = ["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello", "--all"]
+
+            with patch("jules_scheduler.cli.JulesClient.iter_sessions", side_effect=lambda **kw: iter([])), patch(
+                "jules_scheduler.cli.JulesClient.authenticate"
+            ), patch(
+                "jules_scheduler.cli.JulesClient.create_session", return_value={"name": "sessions/7"}
+            ), redirect_stdout(io.StringIO()):
+                main(base)
+                with redirect_stdout(io.StringIO()) as limited:
+                    main(base)
+                with redirect_stdout(io.StringIO()) as overridden:
+                    main([*base, "--repo-daily-budget", "0"])
+            ledger = (Path(td) / "state" / "ledger.json").read_text(encoding="utf-8")
+
+        self.assertIn("sessions/7", ledger)
+        self.assertIn("defer a: repo daily budget of 1 reached", limited.getvalue())
+        self.assertIn("summary: ran=1", overridden.getvalue())
+
+    def test_tick_rejects_bad_config(self):
+        with tempfile.TemporaryDirectory() as td:
+            (Path(td) / ".jules" / "prompts").mkdir(parents=True)
+            (Path(td) / ".jules" / "config.yml").write_text("repo_limit: -1\n", encoding="utf-8")
+
+            with redirect_stdout(io.StringIO()) as out, self.assertRaises(SystemExit) as exit_:
+                main(["tick", "--repo-root", td, "--owner", "octo", "--repo", "hello"])
+
+        self.assertEqual(exit_.exception.code, 2)
+        self.assertIn("expected repo_limit as a non-negative int", out.getvalue())
+
+
+class TestSyncWorkflowFleet(unittest.TestCase):
+    def test_fleet_writes_only_changed_repos(self):
+        with tempfile.TemporaryDirectory() as td:
+            roots = []
+            for name in ("a", "b"):
+                prompts = Path(td) / name / ".jules" / "prompts"
+                prompts.mkdir(parents=True)
+                (prompts / "p.md").write_text('---\nschedule: "0 8 * * *"\n---\nx\n', encoding="utf-8")
+                roots.append(str(Path(td) / name))
+            (Path(td) / "empty").mkdir()
+            roots.append(str(Path(td) / "empty"))
+
+            first = io.StringIO()
+            with redirect_stdout(first):
+                main(["sync-workflow", "--fleet", *roots])
+            (Path(roots[1]) / ".jules" / "prompts" / "p.md").write_text(
+                '---\nschedule: "0 9 * * *"\n---\nx\n', encoding="utf-8"
+            )
+            second = io.StringIO()
+            with redirect_stdout(second):
+                main(["sync-workflow", "--fleet", *roots])
+            empty_has_workflow = (Path(td) / "empty" / ".github").exists()
+
+        self.assertIn("summary: changed=2 unchanged=0 skipped=1 failed=0 repos=3", first.getvalue())
+        self.assertIn("summary: changed=1 unchanged=1 skipped=1 failed=0 repos=3", second.getvalue())
+        self.assertIn(f"updated {Path(roots[1]).resolve()}", second.getvalue())
+        self.assertFalse(empty_has_workflow)
+
+
+if __name__ == "__main__":
+    unittest.main()
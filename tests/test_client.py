@@ -0,0 +1,258 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from jules_scheduler.client import (
+    ActivityCursor,
+    JulesClient,
+    bulk_apply,
+    follow_activities,
+    main,
+    poll_activities,
+    select_sessions,
+)
+
+
+class FakeActivitiesClient:
+    """Serves activities in pages of two, keyed by a page-index token."""
+
+    def __init__(self, activities):
+        self.activities = activities  # session_id -> list of activities
+        self.calls = []
+
+    def get_activities(self, session_id, page_size=None, page_token=None):
+        self.calls.append((session_id, page_token))
+        start = int(page_token or 0)
+        items = self.activities[session_id]
+        page = {"activities": items[start : start + 2]}
+        if start + 2 < len(items):
+            page["nextPageToken"] = str(start + 2)
+        return page
+
+
+def _activity(session_id, n, **extra):
+    return {"name": f"sessions/{session_id}/activities/{n}", **extra}
+
+
+class TestActivityFollow(unittest.TestCase):
+    def test_poll_only_fetches_from_last_page(self):
+        client = FakeActivitiesClient({"s": [_activity("s", i) for i in range(3)]})
+        cursor = ActivityCursor("s")
+
+        first = poll_activities(client, cursor, page_size=2)
+        client.activities["s"].append(_activity("s", 3))
+        client.activities["s"].append(_activity("s", 4))
+        client.calls.clear()
+        second = poll_activities(client, cursor, page_size=2)
+        third = poll_activities(client, cursor, page_size=2)
+
+        self.assertEqual([a["name"][-1] for a in first], ["0", "1", "2"])
+        self.assertEqual([a["name"][-1] for a in second], ["3", "4"])
+        self.assertEqual(third, [])
+        self.assertEqual(client.calls[0], ("s", "2"))
+
+    def test_poll_failure_on_later_page_does_not_repeat(self):
+        client = FakeActivitiesClient({"s": [_activity("s", 0)]})
+        cursor = ActivityCursor("s")
+        self.assertEqual(len(poll_activities(client, cursor, page_size=2)), 1)
+
+        client.activities["s"] += [_activity("s", 1), _activity("s", 2, sessionCompleted={})]
+        fetch = client.get_activities
+
+        def flaky(session_id, page_size=None, page_token=None):
+            if page_token == "2":
+                raise ConnectionError("down")
+            return fetch(session_id, page_size=page_size, page_token=page_token)
+
+        client.get_activities = flaky
+        with self.assertRaises(ConnectionError):
+            poll_activities(client, cursor, page_size=2)
+        self.assertFalse(cursor.finished)
+
+        client.get_activities = fetch
+        retried = poll_activities(client, cursor, page_size=2)
+
+        self.assertEqual([a["name"][-1] for a in retried], ["1", "2"])
+        self.assertTrue(cursor.finished)
+
+    def test_follow_streams_jsonl_and_stops_when_finished(self):
+        client = FakeActivitiesClient(
+            {
+                "a": [_activity("a", 0), _activity("a", 1, sessionCompleted={})],
+                "b": [_activity("b", 0, sessionFailed={})],
+            }
+        )
+        out = io.StringIO()
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        with redirect_stdout(out):
+            follow_activities(client, ["a", "b"], sleep=sleep, clock=lambda: now[0])
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [line["name"] for line in lines],
+            ["sessions/a/activities/0", "sessions/a/activities/1", "sessions/b/activities/0"],
+        )
+        self.assertEqual(sleeps, [])
+
+    def test_follow_backs_off_while_quiet(self):
+        client = FakeActivitiesClient({"a": [_activity("a", 0)]})
+        out = io.StringIO()
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+            if len(sleeps) == 4:
+                client.activities["a"].append(_activity("a", 1, sessionCompleted={}))
+
+        follow_activities(
+            client, ["a"], out=out, min_interval=1, max_interval=4, sleep=sleep, clock=lambda: now[0]
+        )
+
+        self.assertEqual(sleeps, [1, 2, 4, 4])
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+    def test_follow_drops_sessions_that_keep_failing(self):
+        class FailingClient:
+            def __init__(self):
+                self.calls = []
+
+            def get_activities(self, session_id, page_size=None, page_token=None):
+                self.calls.append(session_id)
+                if session_id == "missing":
+                    response = requests.Response()
+                    response.status_code = 404
+                    raise requests.HTTPError("404 Not Found", response=response)
+                raise ConnectionError("down")
+
+        client = FailingClient()
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        with redirect_stderr(io.StringIO()), redirect_stdout(io.StringIO()) as out:
+            follow_activities(client, ["missing", "flaky"], max_errors=3, sleep=sleep, clock=lambda: now[0])
+
+        self.assertEqual(client.calls.count("missing"), 1)
+        self.assertEqual(client.calls.count("flaky"), 3)
+        self.assertEqual(out.getvalue(), "")
+
+
+class FakeSessionsClient(JulesClient):
+    def __init__(self, pages):
+        super().__init__(api_key="x")
+        self.pages = pages
+
+    def list_sessions(self, page_size=None, page_token=None):
+        return self.pages[int(page_token or 0)]
+
+
+class TestBulk(unittest.TestCase):
+    def test_select_sessions_across_pages(self):
+        client = FakeSessionsClient(
+            [
+                {
+                    "sessions": [
+                        {"name": "sessions/1", "title": "routine/janitor: r", "state": "AWAITING_PLAN_APPROVAL"},
+                        {"name": "sessions/2", "title": "routine/docs: r", "state": "AWAITING_PLAN_APPROVAL"},
+                    ],
+                    "nextPageToken": "1",
+                },
+                {
+                    "sessions": [
+                        {"id": "3", "title": "routine/janitor: r", "state": "IN_PROGRESS"},
+                        {"id": "4", "title": "routine/janitor: other", "state": "AWAITING_PLAN_APPROVAL"},
+                    ]
+                },
+            ]
+        )
+
+        self.assertEqual(select_sessions(client, prompt_id="janitor"), ["1", "3", "4"])
+        client.pages[1]["sessions"][0]["state"] = "COMPLETED"
+        self.assertEqual(select_sessions(client, prompt_id="janitor"), ["1", "4"])
+        self.assertEqual(select_sessions(client, prompt_id="janitor", state="COMPLETED"), ["3"])
+        self.assertEqual(
+            select_sessions(client, title_prefix="routine/", state="AWAITING_PLAN_APPROVAL"), ["1", "2", "4"]
+        )
+        self.assertEqual(
+            select_sessions(client, title_prefix="routine/janitor: r", state="AWAITING_PLAN_APPROVAL"), ["1"]
+        )
+
+    def test_bulk_apply_reports_and_resumes(self):
+        calls = []
+        lock = threading.Lock()
+
+        def action(sid):
+            with lock:
+                calls.append(sid)
+            if sid == "bad":
+                raise RuntimeError("boom")
+
+        with tempfile.TemporaryDirectory() as td:
+            progress = os.path.join(td, "progress.jsonl")
+            with redirect_stdout(io.StringIO()) as out:
+                first = bulk_apply(action, ["a", "bad", "b"], workers=2, progress_path=progress)
+            calls.clear()
+            second = bulk_apply(action, ["a", "bad", "b"], workers=2, progress_path=progress, out=io.StringIO())
+
+        results = {item["session"]: item for item in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(first, (2, 1, 0))
+        self.assertEqual(results["bad"], {"session": "bad", "command": None, "ok": False, "error": "boom"})
+        self.assertTrue(results["a"]["ok"])
+        self.assertEqual(second, (0, 1, 2))
+        self.assertEqual(calls, ["bad"])
+
+    def test_bulk_apply_progress_is_per_command_and_skips_bad_lines(self):
+        with tempfile.TemporaryDirectory() as td:
+            progress = os.path.join(td, "progress.jsonl")
+            bulk_apply(lambda sid: None, ["a"], progress_path=progress, out=io.StringIO(), command="approve")
+            with open(progress, "a", encoding="utf-8") as f:
+                f.write('{"session": "b", "comm')
+
+            calls = []
+            with redirect_stderr(io.StringIO()) as err:
+                message = bulk_apply(
+                    calls.append, ["a", "b"], progress_path=progress, out=io.StringIO(), command="message"
+                )
+                approve = bulk_apply(
+                    lambda sid: None, ["a", "b"], progress_path=progress, out=io.StringIO(), command="approve"
+                )
+
+        self.assertEqual(message, (2, 0, 0))
+        self.assertEqual(sorted(calls), ["a", "b"])
+        self.assertEqual(approve, (1, 0, 1))
+        self.assertIn("Skipping unreadable line 2", err.getvalue())
+        self.assertEqual(err.getvalue().count("Skipping unreadable line"), 2)
+
+    def test_bulk_message_requires_a_filter(self):
+        with patch("jules_scheduler.client.JulesClient.iter_sessions") as iter_sessions, redirect_stderr(
+            io.StringIO()
+        ) as err, self.assertRaises(SystemExit) as exit_info:
+            main(["bulk-message", "hi"])
+
+        self.assertEqual(exit_info.exception.code, 2)
+        self.assertIn("needs at least one of --title-prefix, --prompt-id or --state", err.getvalue())
+        iter_sessions.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from jules_scheduler.dispatch import DispatchQueue, count_in_flight
+from jules_scheduler.prompt_files import PromptFile
+
+
+def _prompt(prompt_id, *, priority=0, group=None, branch="main"):
+    return PromptFile(
+        id=prompt_id,
+        path=Path(f"{prompt_id}.md"),
+        enabled=True,
+        schedule=(),
+        branch=branch,
+        automation_mode="AUTO_CREATE_PR",
+        require_plan_approval=False,
+        dedupe=False,
+        title=None,
+        priority=priority,
+        concurrency_group=group,
+    )
+
+
+class TestDispatch(unittest.TestCase):
+    def test_priority_order_with_stable_ties(self):
+        prompts = [_prompt("a"), _prompt("b", priority=5), _prompt("c"), _prompt("d", priority=5)]
+        queue = DispatchQueue(prompts)
+        self.assertEqual([p.id for p in queue], ["b", "d", "a", "c"])
+
+    def test_group_limit_counts_in_flight(self):
+        prompts = [
+            _prompt("a", priority=1, group="docs"),
+            _prompt("b", group="docs"),
+            _prompt("c", group="deps"),
+        ]
+        queue = DispatchQueue(prompts, group_limit=1, in_flight_groups={"deps": 1})
+        order = []
+        for prompt in queue:
+            order.append(prompt.id)
+            queue.started(prompt)
+        self.assertEqual(order, ["a"])
+        self.assertEqual([p.id for p in queue.over_limit], ["b", "c"])
+
+    def test_default_group_is_branch(self):
+        prompts = [_prompt("a"), _prompt("b"), _prompt("c", branch="dev")]
+        queue = DispatchQueue(prompts, group_limit=1)
+        order = []
+        for prompt in queue:
+            order.append(prompt.id)
+            queue.started(prompt)
+        self.assertEqual(order, ["a", "c"])
+
+    def test_repo_limit(self):
+        queue = DispatchQueue([_prompt("a"), _prompt("b")], repo_limit=2, in_flight_total=1)
+        order = []
+        for prompt in queue:
+            order.append(prompt.id)
+            queue.started(prompt)
+        self.assertEqual(order, ["a"])
+
+    def test_count_in_flight(self):
+        sessions = [
+            {"title": "routine/a: r", "state": "IN_PROGRESS", "sourceContext": {"source": "sources/github/o/r"}},
+            {"title": "routine/a: r", "state": "COMPLETED", "sourceContext": {"source": "sources/github/o/r"}},
+            {"title": "manual", "state": "PLANNING", "sourceContext": {"source": "sources/github/o/r"}},
+            {"title": "routine/a: r", "state": "PLANNING", "sourceContext": {"source": "sources/github/o/other"}},
+        ]
+        total, groups = count_in_flight(
+            sessions, owner="o", repo="r", groups_by_title={"routine/a: r": "branch:main"}
+        )
+        self.assertEqual(total, 2)
+        self.assertEqual(groups, {"branch:main": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from croniter import croniter
+
+from jules_scheduler.forecast import forecast
+
+
+def _brute_force(schedules, start, days):
+    start_dt = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    end = start_dt + timedelta(days=days)
+    counts = [0] * (days * 24 * 60)
+    for expr in schedules:
+        it = croniter(expr, start_dt - timedelta(minutes=1))
+        while (fire := it.get_next(datetime)) < end:
+            counts[int((fire - start_dt).total_seconds()) // 60] += 1
+    return counts
+
+
+class TestForecast(unittest.TestCase):
+    def test_matches_croniter(self):
+        schedules = [
+            "0 8 * * *",
+            "0 8 * * *",
+            "*/15 9-17 * * 1-5",
+            "30 2 15 * 1",
+            "0 0 L * *",
+            "0 0 * * 1#2",
+            "0 0 29 2 *",
+        ]
+        start = date(2024, 1, 1)
+        result = forecast(schedules, start=start, days=400)
+        self.assertEqual(result.counts, _brute_force(schedules, start, 400))
+
+    def test_histograms_and_peaks(self):
+        result = forecast(["0 8 * * *", "0 8 * * *", "10 8 * * *"], start=date(2025, 1, 1), days=2)
+
+        self.assertEqual(result.total, 6)
+        self.assertEqual(result.per_hour_of_day()[8], 6)
+        self.assertEqual(result.per_minute_of_hour()[0], 4)
+        self.assertEqual(result.peak_minute(), (datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc), 2))
+        self.assertEqual(result.peak_hour(), (datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc), 3))
+        self.assertEqual(result.peak_concurrency(30)[1], 3)
+        self.assertEqual(result.peak_concurrency(5)[1], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ import sys
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from jules_scheduler.prompt_files import parse_prompt_file
+from jules_scheduler.prompt_files import parse_prompt_file, spread_offset
 
 
 class TestPromptFiles(unittest.TestCase):
@@ -29,6 +29,7 @@ Hello {{ repo_full }}
                 encoding="utf-8",
             )
             prompt = parse_prompt_file(path)
+            body = prompt.body
 
         self.assertEqual(prompt.id, "janitor")
         self.assertTrue(prompt.enabled)
@@ -37,7 +38,27 @@ Hello {{ repo_full }}
         self.assertEqual(prompt.automation_mode, "AUTO_CREATE_PR")
         self.assertFalse(prompt.require_plan_approval)
         self.assertTrue(prompt.dedupe)
-        self.assertIn("Hello", prompt.body)
+        self.assertEqual(body, "Hello {{ repo_full }}\n")
+
+    def test_body_is_loaded_lazily(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "p.md"
+            path.write_text("---\nid: p\n---\n\nfirst\n", encoding="utf-8")
+            prompt = parse_prompt_file(path)
+            self.assertFalse(hasattr(prompt, "__dict__"))
+            self.assertEqual(prompt.body, "first\n")
+            path.write_text("---\nid: p\n---\nsecond\n", encoding="utf-8")
+            self.assertEqual(prompt.body, "second\n")
+
+    def test_no_frontmatter_uses_whole_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "plain.md"
+            path.write_text("just a body\n", encoding="utf-8")
+            prompt = parse_prompt_file(path)
+            body = prompt.body
+
+        self.assertEqual(prompt.id, "plain")
+        self.assertEqual(body, "just a body\n")
 
     def test_due_check(self):
         with tempfile.TemporaryDirectory() as td:
@@ -55,6 +76,71 @@ x
         self.assertTrue(prompt.is_due(datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)))
         self.assertFalse(prompt.is_due(datetime(2025, 1, 1, 8, 1, tzinfo=timezone.utc)))
 
+    def test_spread_minutes_shifts_due_minute(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "p.md"
+            path.write_text(
+                """---
+id: spread
+schedule: "0 8 * * *"
+spread_minutes: 60
+---
+x
+""",
+                encoding="utf-8",
+            )
+            prompt = parse_prompt_file(path)
+
+        offset = spread_offset("spread", 60)
+        self.assertEqual(prompt.effective_schedule, (f"{offset} 8 * * *",))
+        self.assertTrue(prompt.is_due(datetime(2025, 1, 1, 8, offset, tzinfo=timezone.utc)))
+        if offset:
+            self.assertFalse(prompt.is_due(datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)))
+
+    def test_spread_offset_is_stable_and_bounded(self):
+        self.assertEqual(spread_offset("janitor", 30), spread_offset("janitor", 30))
+        self.assertEqual(spread_offset("janitor", 0), 0)
+        offsets = {spread_offset(f"p{i}", 30) for i in range(200)}
+        self.assertTrue(all(0 <= o < 30 for o in offsets))
+        self.assertGreater(len(offsets), 1)
+
+    def test_spread_never_fires_early_and_shifts_lists(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "p.md"
+            path.write_text(
+                """---
+id: late
+schedule:
+  - "50 8 * * *"
+  - "0,30 9 * * *"
+spread_minutes: 30
+---
+x
+""",
+                encoding="utf-8",
+            )
+            prompt = parse_prompt_file(path)
+
+        late = spread_offset("late", 10)
+        listed = spread_offset("late", 30)
+        self.assertEqual(prompt.effective_schedule, (f"{50 + late} 8 * * *", f"{listed},{30 + listed} 9 * * *"))
+
+    def test_spread_leaves_step_expressions(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "p.md"
+            path.write_text(
+                """---
+schedule: "*/15 * * * *"
+spread_minutes: 15
+---
+x
+""",
+                encoding="utf-8",
+            )
+            prompt = parse_prompt_file(path)
+
+        self.assertEqual(prompt.effective_schedule, ("*/15 * * * *",))
+
 
 if __name__ == "__main__":
     unittest.main()
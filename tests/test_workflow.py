@@ -1,3 +1,4 @@
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -5,6 +6,7 @@ import sys
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
+from jules_scheduler.prompt_files import spread_offset
 from jules_scheduler.workflow import write_workflow
 
 
@@ -45,6 +47,79 @@ b
         self.assertIn("cron: '0 9 * * 1'", content)
         self.assertIn("uvx --from git+https://example.com/x@y jules-scheduler tick", content)
 
+    def test_write_workflow_uses_spread_schedule(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            prompts = root / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text(
+                """---
+id: a
+schedule: "0 8 * * *"
+spread_minutes: 60
+---
+a
+""",
+                encoding="utf-8",
+            )
+
+            wf = root / ".github" / "workflows" / "jules_scheduler.yml"
+            write_workflow(
+                workflow_path=wf,
+                prompts_dir=prompts,
+                source_ref="git+https://example.com/x@y",
+            )
+            content = wf.read_text(encoding="utf-8")
+
+        self.assertIn(f"cron: '{spread_offset('a', 60)} 8 * * *'", content)
+
+    def test_write_workflow_skips_unchanged_content(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            prompts = root / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text('---\nschedule: "0 8 * * *"\n---\na\n', encoding="utf-8")
+            wf = root / ".github" / "workflows" / "jules_scheduler.yml"
+            kwargs = dict(workflow_path=wf, prompts_dir=prompts, source_ref="x")
+
+            self.assertTrue(write_workflow(**kwargs))
+            os.utime(wf, (1_000_000, 1_000_000))
+            self.assertFalse(write_workflow(**kwargs))
+            unchanged_mtime = wf.stat().st_mtime
+
+            (prompts / "a.md").write_text('---\nschedule: "0 9 * * *"\n---\na\n', encoding="utf-8")
+            self.assertTrue(write_workflow(**kwargs))
+            content = wf.read_text(encoding="utf-8")
+
+        self.assertEqual(unchanged_mtime, 1_000_000)
+        self.assertIn("cron: '0 9 * * *'", content)
+
+    def test_write_workflow_caches_ledger_when_budgeted(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            prompts = root / ".jules" / "prompts"
+            prompts.mkdir(parents=True)
+            (prompts / "a.md").write_text('---\nschedule: "0 8 * * *"\n---\na\n', encoding="utf-8")
+            wf = root / ".github" / "workflows" / "jules_scheduler.yml"
+            kwargs = dict(workflow_path=wf, prompts_dir=prompts, source_ref="x")
+
+            write_workflow(**kwargs)
+            plain = wf.read_text(encoding="utf-8")
+            (root / ".jules" / "config.yml").write_text("repo_limit: 2\n", encoding="utf-8")
+            self.assertFalse(write_workflow(**kwargs))
+
+            (root / ".jules" / "config.yml").write_text(
+                "repo_daily_budget: 5\nbudget_file: state/ledger.json\n", encoding="utf-8"
+            )
+            self.assertTrue(write_workflow(**kwargs))
+            cached = wf.read_text(encoding="utf-8")
+
+        self.assertNotIn("actions/cache", plain)
+        self.assertIn("uses: actions/cache@v4", cached)
+        self.assertIn("path: state/ledger.json", cached)
+        self.assertIn("key: jules-budget-${{ github.run_id }}", cached)
+        self.assertLess(cached.index("actions/cache"), cached.index("jules-scheduler tick"))
+
 
 if __name__ == "__main__":
     unittest.main()